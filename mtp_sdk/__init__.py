@@ -1,11 +1,12 @@
 import json
 import sys
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 import click
 
-from .introspect import generate_schema
+from .introspect import _describe_to_dict, generate_schema
 from .types import (
+    MTP_SPEC_VERSION,
     ArgDescriptor,
     AuthConfig,
     CommandAnnotation,
@@ -17,7 +18,18 @@ from .types import (
     to_dict,
 )
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec.json
+except ImportError:
+    msgspec = None  # type: ignore[assignment]
+
 __all__ = [
+    "MTP_SPEC_VERSION",
     "describe",
     "with_describe",
     "ArgDescriptor",
@@ -32,8 +44,45 @@ __all__ = [
 ]
 
 
+def _dumps(data: Dict[str, Any]) -> bytes:
+    # The fast encoders reject some inputs json.dumps accepts (e.g. ints
+    # wider than 64 bits in a default); those fall back to the stdlib.
+    try:
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        if msgspec is not None:
+            return msgspec.json.encode(data)
+    except TypeError:
+        pass
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _schema_json(cli: click.Command, options: Optional[DescribeOptions]) -> bytes:
+    cached: Optional[Tuple[Optional[DescribeOptions], bytes]] = getattr(
+        cli, "__mtp_describe_bytes__", None
+    )
+    if cached is not None and cached[0] is options:
+        return cached[1]
+    data = _dumps(_describe_to_dict(cli, options))
+    setattr(cli, "__mtp_describe_bytes__", (options, data))
+    return data
+
+
+def _write_stdout(data: bytes) -> None:
+    """Write a JSON document and newline to stdout in one buffered flush."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # Text-only replacement stream (e.g. io.StringIO)
+        click.echo(data.decode())
+        return
+    sys.stdout.flush()
+    buffer.write(data)
+    buffer.write(b"\n")
+    buffer.flush()
+
+
 def describe(
-    cli: click.BaseCommand,
+    cli: click.Command,
     options: Optional[DescribeOptions] = None,
 ) -> ToolSchema:
     """Pure function. Returns ToolSchema without side effects."""
@@ -41,16 +90,17 @@ def describe(
 
 
 def with_describe(
-    cli: click.BaseCommand,
+    cli: click.Command,
     options: Optional[DescribeOptions] = None,
-) -> click.BaseCommand:
+) -> click.Command:
     """Adds --describe as an eager option. On --describe: print JSON, exit 0."""
 
     def _describe_callback(ctx: click.Context, param: click.Parameter, value: bool) -> None:
-        if not value:
+        # Schema work happens only here, and only when the flag is actually given;
+        # shell completion parses resiliently and must not print the schema.
+        if not value or ctx.resilient_parsing:
             return
-        schema = describe(cli, options)
-        click.echo(json.dumps(to_dict(schema), separators=(",", ":")))
+        _write_stdout(_schema_json(cli, options))
         ctx.exit(0)
 
     if isinstance(cli, click.Command):
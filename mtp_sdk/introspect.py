@@ -1,21 +1,52 @@
-from typing import Dict, List, Optional
+import sys
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
 import click.types as ctypes
 
 from .types import (
+    MTP_SPEC_VERSION,
     ArgDescriptor,
     CommandAnnotation,
     CommandDescriptor,
     DescribeOptions,
     ToolSchema,
+    to_dict,
 )
 
-MTP_SPEC_VERSION = "2026-02-07"
+# Click parameters don't change after decoration, so per-parameter results are
+# memoized by identity. Weak keys let parameters of discarded CLIs be collected.
+_TYPE_CACHE: "weakref.WeakKeyDictionary[click.Parameter, tuple]" = weakref.WeakKeyDictionary()
+
+# Exact Click type -> result, checked before the isinstance ladder below.
+# Click's INT/FLOAT/BOOL/STRING singletons all resolve here in one lookup;
+# subclasses of these types miss and fall through to the ladder.
+_TYPE_DISPATCH: Dict[type, tuple] = {
+    ctypes.IntParamType: ("integer", None),
+    click.IntRange: ("integer", None),
+    ctypes.FloatParamType: ("number", None),
+    click.FloatRange: ("number", None),
+    ctypes.BoolParamType: ("boolean", None),
+    click.Path: ("path", None),
+    ctypes.StringParamType: ("string", None),
+}
+
+
+# Click's "no default" sentinel type, remembered after the first match so
+# later checks are a single identity comparison.
+_SENTINEL_TYPE: Optional[type] = None
 
 
 def _is_sentinel(value: object) -> bool:
-    return type(value).__name__ == "Sentinel"
+    global _SENTINEL_TYPE
+    t = type(value)
+    if t is _SENTINEL_TYPE:
+        return True
+    if t.__name__ == "Sentinel":
+        _SENTINEL_TYPE = t
+        return True
+    return False
 
 
 def _infer_type(
@@ -23,21 +54,39 @@ def _infer_type(
     type_overrides: Optional[Dict[str, str]] = None,
 ) -> tuple:
     """Return (mtp_type, values) for a Click parameter."""
-    name = param.name or ""
-    if type_overrides and name in type_overrides:
-        return type_overrides[name], None
+    if type_overrides:
+        override = type_overrides.get(param.name or "")
+        if override is not None:
+            return override, None
+
+    cached = _TYPE_CACHE.get(param)
+    if cached is None:
+        cached = _TYPE_CACHE[param] = _infer_type_uncached(param)
+    return cached
 
+
+def _infer_type_uncached(param: click.Parameter) -> tuple:
     pt = param.type
+    option = param if isinstance(param, click.Option) else None
 
-    if isinstance(param, click.Option) and param.is_flag:
+    if option is not None and option.is_flag:
         return "boolean", None
 
     if isinstance(pt, click.Choice):
-        return "enum", list(pt.choices)
+        # A tuple, since the cached result is shared by every caller
+        return "enum", tuple(pt.choices)
 
-    if param.nargs == -1 or (isinstance(param, click.Option) and param.multiple):
+    if param.nargs == -1 or (option is not None and option.multiple):
         return "array", None
 
+    # Count options (e.g. -vvv) always produce an int, whatever their type
+    if option is not None and option.count:
+        return "integer", None
+
+    hit = _TYPE_DISPATCH.get(type(pt))
+    if hit is not None:
+        return hit
+
     if isinstance(pt, (ctypes.IntParamType, click.IntRange)):
         return "integer", None
     if isinstance(pt, (ctypes.FloatParamType, click.FloatRange)):
@@ -47,14 +96,11 @@ def _infer_type(
     if isinstance(pt, click.Path):
         return "path", None
 
-    # Count options (e.g. -vvv)
-    if isinstance(param, click.Option) and param.count:
-        return "integer", None
-
     return "string", None
 
 
-_FILTERED_NAMES = frozenset(("help", "version", "mtp_describe"))
+# A three-item tuple scan is cheaper than hashing the name for a set lookup
+_FILTERED_NAMES = ("help", "version", "mtp_describe")
 
 
 def _is_filtered_param(param: click.Parameter) -> bool:
@@ -68,128 +114,179 @@ def _is_filtered_param(param: click.Parameter) -> bool:
 
 def _option_display_name(param: click.Option) -> str:
     """Return the longest option string (prefer --long over -s)."""
-    opts = param.opts + param.secondary_opts
-    return max(opts, key=len) if opts else param.name or ""
+    # Stored on the option itself; interned so later comparisons are by identity
+    cached = getattr(param, "__mtp_display_name__", None)
+    if cached is None:
+        opts = param.opts + param.secondary_opts
+        cached = sys.intern(max(opts, key=len) if opts else param.name or "")
+        setattr(param, "__mtp_display_name__", cached)
+    return cached
 
 
-def _extract_arg(
+def _arg_fields(
     param: click.Parameter,
     type_overrides: Optional[Dict[str, str]] = None,
     arg_descriptions: Optional[Dict[str, str]] = None,
-) -> ArgDescriptor:
+) -> tuple:
+    """Return ArgDescriptor's field values for a parameter, in field order.
+
+    Absent fields are None. Enum values are kept as the tuple _infer_type
+    shares; _arg_descriptor and _arg_dict copy them into lists.
+    """
     mtp_type, values = _infer_type(param, type_overrides)
+    option = param if isinstance(param, click.Option) else None
 
-    if isinstance(param, click.Option):
-        name = _option_display_name(param)
+    if option is not None:
+        name = _option_display_name(option)
     else:
         name = param.name or ""
 
     desc = None
-    if isinstance(param, click.Option):
-        desc = param.help
-    elif arg_descriptions and param.name and param.name in arg_descriptions:
-        desc = arg_descriptions[param.name]
-
-    arg = ArgDescriptor(name=name, type=mtp_type)
-    if desc:
-        arg.description = desc
-    if values:
-        arg.values = values
-
-    if isinstance(param, click.Option):
-        arg.required = param.required
-    elif isinstance(param, click.Argument):
-        arg.required = param.required
+    if option is not None:
+        desc = option.help
+    elif arg_descriptions and param.name:
+        desc = arg_descriptions.get(param.name)
+
+    required = None
+    if option is not None or isinstance(param, click.Argument):
+        required = param.required
 
     default = param.default
     # Skip None, empty tuples, sentinels, and False for boolean flags
     if (
-        default is not None
-        and default != ()
-        and not _is_sentinel(default)
-        and not (isinstance(param, click.Option) and param.is_flag and default is False)
+        default is None
+        or default == ()
+        or _is_sentinel(default)
+        or (option is not None and option.is_flag and default is False)
+    ):
+        default = None
+    elif (
+        mtp_type in ("integer", "number")
+        and isinstance(default, str)
     ):
-        if (
-            mtp_type in ("integer", "number")
-            and isinstance(default, str)
-        ):
-            try:
-                default = int(default) if mtp_type == "integer" else float(default)
-            except (ValueError, TypeError):
-                pass
-        arg.default = default
+        try:
+            default = int(default) if mtp_type == "integer" else float(default)
+        except (ValueError, TypeError):
+            pass
 
-    return arg
+    return name, mtp_type, desc or None, required, default, tuple(values) if values else None
 
 
-def _walk_commands(
-    cmd: click.BaseCommand,
-    annotations: Optional[Dict[str, CommandAnnotation]] = None,
+def _arg_descriptor(arg: tuple) -> ArgDescriptor:
+    name, mtp_type, desc, required, default, values = arg
+    return ArgDescriptor(
+        name, mtp_type, desc, required, default, list(values) if values is not None else None
+    )
+
+
+def _extract_arg(
+    param: click.Parameter,
+    type_overrides: Optional[Dict[str, str]] = None,
+    arg_descriptions: Optional[Dict[str, str]] = None,
+) -> ArgDescriptor:
+    return _arg_descriptor(_arg_fields(param, type_overrides, arg_descriptions))
+
+
+def _short_desc(text: Optional[str]) -> str:
+    """First line of a help text; Click help often spans several lines."""
+    if not text:
+        return ""
+    return text.lstrip().partition("\n")[0].rstrip()
+
+
+def _visible_subcommands(group: click.Group) -> List[Tuple[str, click.Command]]:
+    if (
+        type(group).list_commands is click.Group.list_commands
+        and type(group).get_command is click.Group.get_command
+    ):
+        # Stock Group: read the registry directly, in list_commands' sorted order
+        return _visible(sorted(group.commands.items()))
+    # Lazy or custom groups resolve commands themselves; share one context
+    ctx = click.Context(group, info_name="")
+    return _visible([(sn, group.get_command(ctx, sn)) for sn in group.list_commands(ctx)])
+
+
+def _visible(
+    pairs: List[Tuple[str, Optional[click.Command]]],
+) -> List[Tuple[str, click.Command]]:
+    return [(sn, sub) for sn, sub in pairs if sub and not getattr(sub, "hidden", False)]
+
+
+def _leaf_commands(
+    cmd: click.Command,
     parent_path: Optional[str] = None,
-) -> List[CommandDescriptor]:
-    if isinstance(cmd, click.Group):
-        sub_names = cmd.list_commands(click.Context(cmd, info_name=""))
-        visible = []
-        for sn in sub_names:
-            sub = cmd.get_command(click.Context(cmd, info_name=""), sn)
-            if sub and not getattr(sub, "hidden", False):
-                visible.append((sn, sub))
-
-        if visible:
-            results = []
-            for sn, sub in visible:
-                sub_path = f"{parent_path} {sn}" if parent_path else sn
-                results.extend(_walk_commands(sub, annotations, sub_path))
-            return results
-
-    # Leaf command or no visible subcommands
-    name = parent_path or "_root"
-    return [_build_command(cmd, name, annotations.get(name) if annotations else None)]
-
-
-def _build_command(
-    cmd: click.BaseCommand,
-    name: str,
-    annotation: Optional[CommandAnnotation] = None,
-) -> CommandDescriptor:
-    help_text = ""
-    if isinstance(cmd, click.Command):
-        help_text = cmd.help or ""
-    # Click wraps help text with newlines sometimes; take the short description
-    if help_text:
-        help_text = help_text.strip().split("\n")[0].strip()
+) -> List[Tuple[click.Command, str]]:
+    """Return (command, path) for every leaf under cmd, depth-first."""
+    leaves: List[Tuple[click.Command, str]] = []
+    # Explicit stack; children are pushed in reverse so they pop (and appear in
+    # the output) in list_commands order.
+    stack: List[Tuple[click.Command, Optional[str]]] = [(cmd, parent_path)]
+    while stack:
+        cmd, path = stack.pop()
+        if isinstance(cmd, click.Group):
+            visible = _visible_subcommands(cmd)
+            if visible:
+                for sn, sub in reversed(visible):
+                    stack.append((sub, f"{path} {sn}" if path else sn))
+                continue
+        # Leaf command or no visible subcommands
+        leaves.append((cmd, path or "_root"))
+    return leaves
+
 
-    descriptor = CommandDescriptor(name=name, description=help_text)
+def _command_help(cmd: click.Command) -> str:
+    return _short_desc(cmd.help) if isinstance(cmd, click.Command) else ""
+
+
+def _command_arg_fields(
+    cmd: click.Command,
+    annotation: Optional[CommandAnnotation] = None,
+) -> Tuple[tuple, ...]:
+    """Return _arg_fields for each visible parameter, positionals before options."""
+    if not isinstance(cmd, click.Command):
+        return ()
 
     type_overrides = annotation.arg_types if annotation else None
     arg_descriptions = annotation.arg_descriptions if annotation else None
 
-    args: List[ArgDescriptor] = []
-    if isinstance(cmd, click.Command):
-        for param in cmd.params:
-            if _is_filtered_param(param):
-                continue
-            args.append(_extract_arg(param, type_overrides, arg_descriptions))
+    positional: List[tuple] = []
+    options: List[tuple] = []
+    for param in cmd.params:
+        if _is_filtered_param(param):
+            continue
+        arg = _arg_fields(param, type_overrides, arg_descriptions)
+        (options if arg[0].startswith("-") else positional).append(arg)
+    return tuple(positional + options)
 
-    if args:
-        # Positional arguments first, then options
-        positional = [a for a in args if not a.name.startswith("-")]
-        options = [a for a in args if a.name.startswith("-")]
-        descriptor.args = positional + options
 
-    if annotation:
-        if annotation.stdin:
-            descriptor.stdin = annotation.stdin
-        if annotation.stdout:
-            descriptor.stdout = annotation.stdout
-        if annotation.examples:
-            descriptor.examples = annotation.examples
+def _walk_commands(
+    cmd: click.Command,
+    annotations: Optional[Dict[str, CommandAnnotation]] = None,
+    parent_path: Optional[str] = None,
+) -> List[CommandDescriptor]:
+    results: List[CommandDescriptor] = []
+    for leaf, name in _leaf_commands(cmd, parent_path):
+        annotation = annotations.get(name) if annotations else None
+        descriptor = CommandDescriptor(name=name, description=_command_help(leaf))
 
-    return descriptor
+        args = _command_arg_fields(leaf, annotation)
+        if args:
+            descriptor.args = [_arg_descriptor(arg) for arg in args]
+
+        if annotation:
+            if annotation.stdin:
+                descriptor.stdin = annotation.stdin
+            if annotation.stdout:
+                descriptor.stdout = annotation.stdout
+            if annotation.examples:
+                descriptor.examples = annotation.examples
+
+        results.append(descriptor)
+    return results
 
 
 def generate_schema(
-    cli: click.BaseCommand,
+    cli: click.Command,
     options: Optional[DescribeOptions] = None,
 ) -> ToolSchema:
     name = ""
@@ -200,11 +297,7 @@ def generate_schema(
     if options and options.version:
         version = options.version
 
-    description = ""
-    if isinstance(cli, click.Command):
-        description = cli.help or ""
-    if description:
-        description = description.strip().split("\n")[0].strip()
+    description = _command_help(cli)
 
     commands = _walk_commands(
         cli,
@@ -223,3 +316,55 @@ def generate_schema(
         schema.auth = options.auth
 
     return schema
+
+
+# camelCase keys of ArgDescriptor, in the order _arg_fields returns values
+_ARG_KEYS = tuple(key for _, key in getattr(ArgDescriptor, "_CAMEL_FIELDS"))
+
+
+def _arg_dict(arg: tuple) -> Dict[str, Any]:
+    data = {key: val for key, val in zip(_ARG_KEYS, arg) if val is not None}
+    if "values" in data:
+        data["values"] = list(data["values"])
+    return data
+
+
+def _describe_to_dict(
+    cli: click.Command,
+    options: Optional[DescribeOptions] = None,
+) -> Dict[str, Any]:
+    """Build the JSON-ready schema dict directly from Click.
+
+    Equal to ``to_dict(generate_schema(cli, options))``, without creating the
+    intermediate descriptor dataclasses. Used for --mtp-describe output.
+    """
+    annotations = options.commands if options else None
+    commands: List[Dict[str, Any]] = []
+    for leaf, path in _leaf_commands(cli):
+        annotation = annotations.get(path) if annotations else None
+        entry: Dict[str, Any] = {"name": path, "description": _command_help(leaf)}
+
+        args = _command_arg_fields(leaf, annotation)
+        if args:
+            entry["args"] = [_arg_dict(arg) for arg in args]
+
+        if annotation:
+            if annotation.stdin:
+                entry["stdin"] = to_dict(annotation.stdin)
+            if annotation.stdout:
+                entry["stdout"] = to_dict(annotation.stdout)
+            if annotation.examples:
+                entry["examples"] = to_dict(annotation.examples)
+
+        commands.append(entry)
+
+    data: Dict[str, Any] = {
+        "name": (cli.name or "") if isinstance(cli, click.Command) else "",
+        "version": (options.version or "") if options else "",
+        "description": _command_help(cli),
+        "specVersion": MTP_SPEC_VERSION,
+        "commands": commands,
+    }
+    if options and options.auth:
+        data["auth"] = to_dict(options.auth)
+    return data
@@ -1,22 +1,135 @@
+import functools
+import sys
 from dataclasses import dataclass, field, fields
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
 
+_C = TypeVar("_C", bound=type)
 
-@dataclass
+MTP_SPEC_VERSION = "2026-02-07"
+
+# Slotted instances drop the per-object __dict__; the option needs Python 3.10+
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@functools.lru_cache(maxsize=256)
+def _snake_to_camel(name: str) -> str:
+    parts = name.split("_")
+    return parts[0] + "".join(p.capitalize() for p in parts[1:])
+
+
+_Serializer = Callable[[Any], Dict[str, Any]]
+
+# One generated serializer per dataclass type; schema classes register theirs
+# at definition time, other dataclasses on first use.
+_SERIALIZERS: Dict[type, _Serializer] = {}
+
+_PRIMITIVES = (str, int, float, bool)
+
+
+def _field_keys(cls: type) -> Tuple[Tuple[str, str], ...]:
+    # Only the class's own table counts; a subclass may add fields
+    return cls.__dict__.get("_CAMEL_FIELDS") or tuple(
+        (f.name, _snake_to_camel(f.name)) for f in fields(cls)
+    )
+
+
+def _is_plain(val: Any) -> bool:
+    return not (hasattr(val, "__dataclass_fields__") or isinstance(val, (list, dict)))
+
+
+def _convert(val: Any) -> Any:
+    """Generic conversion for fields whose annotation doesn't pin down a shape."""
+    if isinstance(val, list):
+        if val and not _is_plain(val[0]):
+            return [to_dict(item) for item in val]
+        # Lists of primitives (e.g. enum values) need no conversion
+        return val[:]
+    if hasattr(val, "__dataclass_fields__"):
+        return to_dict(val)
+    return val
+
+
+def _value_expr(annotation: Any) -> str:
+    """Python expression converting a non-None field value ``v`` per its annotation."""
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        annotation = args[0] if len(args) == 1 else Any
+    origin = get_origin(annotation)
+    if origin is list:
+        (item,) = get_args(annotation) or (Any,)
+        if hasattr(item, "__dataclass_fields__"):
+            return "[to_dict(x) for x in v]"
+        if item in _PRIMITIVES:
+            return "v[:]"
+    elif origin is dict or annotation in _PRIMITIVES:
+        return "v"
+    elif hasattr(annotation, "__dataclass_fields__"):
+        return "to_dict(v)"
+    return "_convert(v)"
+
+
+def _make_serializer(cls: type) -> _Serializer:
+    """Generate a straight-line serializer for one dataclass type.
+
+    Each field becomes an attribute read, a None check and a conversion chosen
+    from its annotation. A field with ``metadata={"flatten": True}`` has its
+    dict merged into the output instead of being nested under its own key.
+    """
+    by_name = {f.name: f for f in fields(cls)}
+    lines = ["def serialize(obj):", "    d = {}"]
+    for attr, key in _field_keys(cls):
+        f = by_name[attr]
+        lines.append(f"    v = obj.{attr}")
+        if f.metadata.get("flatten"):
+            lines += ["    if v:", "        d.update(v)", "    elif v is not None:"]
+        else:
+            lines.append("    if v is not None:")
+        lines.append(f"        d[{key!r}] = {_value_expr(f.type)}")
+    lines.append("    return d")
+    namespace: Dict[str, Any] = {}
+    source = "\n".join(lines)
+    exec(compile(source, f"<serializer {cls.__qualname__}>", "exec"), globals(), namespace)
+    serializer: _Serializer = namespace["serialize"]
+    return serializer
+
+
+def _serializable(cls: _C) -> _C:
+    """Precompute a schema class's camelCase keys and serializer at class creation."""
+    pairs = tuple((f.name, _snake_to_camel(f.name)) for f in fields(cls))
+    setattr(cls, "_CAMEL_FIELDS", pairs)
+    _SERIALIZERS[cls] = _make_serializer(cls)
+    return cls
+
+
+@_serializable
+@dataclass(**_DATACLASS_OPTIONS)
 class Example:
     description: str
     command: str
     output: Optional[str] = None
 
 
-@dataclass
+@_serializable
+@dataclass(**_DATACLASS_OPTIONS)
 class IODescriptor:
     content_type: Optional[str] = None
     description: Optional[str] = None
     schema: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@_serializable
+@dataclass(**_DATACLASS_OPTIONS)
 class ArgDescriptor:
     name: str
     type: str
@@ -26,7 +139,8 @@ class ArgDescriptor:
     values: Optional[List[str]] = None
 
 
-@dataclass
+@_serializable
+@dataclass(**_DATACLASS_OPTIONS)
 class CommandDescriptor:
     name: str
     description: str
@@ -35,15 +149,22 @@ class CommandDescriptor:
     stdout: Optional[IODescriptor] = None
     examples: Optional[List[Example]] = None
 
+    def args_by_name(self) -> Dict[str, ArgDescriptor]:
+        """Index args by name (e.g. ``"--format"``) for repeated lookups."""
+        return {arg.name: arg for arg in self.args or ()}
 
-@dataclass
+
+@_serializable
+@dataclass(**_DATACLASS_OPTIONS)
 class AuthConfig:
     type: str
     description: Optional[str] = None
-    extra: Optional[Dict[str, Any]] = None
+    # Serialized by merging its keys into the auth object itself
+    extra: Optional[Dict[str, Any]] = field(default=None, metadata={"flatten": True})
 
 
-@dataclass
+@_serializable
+@dataclass(**_DATACLASS_OPTIONS)
 class ToolSchema:
     name: str
     version: str
@@ -53,7 +174,8 @@ class ToolSchema:
     auth: Optional[AuthConfig] = None
 
 
-@dataclass
+@_serializable
+@dataclass(**_DATACLASS_OPTIONS)
 class CommandAnnotation:
     stdin: Optional[IODescriptor] = None
     stdout: Optional[IODescriptor] = None
@@ -62,40 +184,21 @@ class CommandAnnotation:
     arg_descriptions: Optional[Dict[str, str]] = None
 
 
-@dataclass
+@_serializable
+@dataclass(**_DATACLASS_OPTIONS)
 class DescribeOptions:
     version: Optional[str] = None
     commands: Optional[Dict[str, CommandAnnotation]] = None
     auth: Optional[AuthConfig] = None
 
 
-def _snake_to_camel(name: str) -> str:
-    parts = name.split("_")
-    return parts[0] + "".join(p.capitalize() for p in parts[1:])
-
-
 def to_dict(obj: Any) -> Any:
     if isinstance(obj, list):
         return [to_dict(item) for item in obj]
-    if not hasattr(obj, "__dataclass_fields__"):
-        return obj
-    result = {}
-    for f in fields(obj):
-        val = getattr(obj, f.name)
-        if val is None:
-            continue
-        key = _snake_to_camel(f.name)
-        if isinstance(val, list):
-            result[key] = [to_dict(item) for item in val]
-        elif hasattr(val, "__dataclass_fields__"):
-            result[key] = to_dict(val)
-        elif isinstance(val, dict):
-            result[key] = val
-        else:
-            result[key] = val
-    # Flatten AuthConfig.extra into the parent dict
-    if isinstance(obj, AuthConfig) and obj.extra:
-        del result["extra"]
-        for k, v in obj.extra.items():
-            result[k] = v
-    return result
+    serializer = _SERIALIZERS.get(type(obj))
+    if serializer is None:
+        if not hasattr(obj, "__dataclass_fields__"):
+            return obj
+        serializer = _SERIALIZERS[type(obj)] = _make_serializer(type(obj))
+    return serializer(obj)
+
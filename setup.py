@@ -0,0 +1,24 @@
+"""Optional mypyc build.
+
+Project metadata lives in pyproject.toml. Setting MTP_SDK_MYPYC=1 compiles
+the introspection and serialization modules with mypyc; if mypyc can't be
+imported the build falls back to the pure-Python package:
+
+    pip install mypy
+    MTP_SDK_MYPYC=1 pip install --no-build-isolation .
+"""
+
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get("MTP_SDK_MYPYC") == "1":
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        pass
+    else:
+        ext_modules = mypycify(["mtp_sdk/introspect.py", "mtp_sdk/types.py"])
+
+setup(ext_modules=ext_modules)
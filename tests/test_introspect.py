@@ -3,14 +3,14 @@ import pytest
 
 from mtp_sdk.introspect import (
     MTP_SPEC_VERSION,
-    _build_command,
+    _describe_to_dict,
     _extract_arg,
     _infer_type,
     _is_filtered_param,
     _walk_commands,
     generate_schema,
 )
-from mtp_sdk.types import AuthConfig, CommandAnnotation, DescribeOptions
+from mtp_sdk.types import AuthConfig, CommandAnnotation, DescribeOptions, to_dict
 
 
 # --- _infer_type ---
@@ -33,7 +33,7 @@ class TestInferType:
         param = cli.params[0]
         mtp_type, values = _infer_type(param)
         assert mtp_type == "enum"
-        assert values == ["red", "green", "blue"]
+        assert values == ("red", "green", "blue")
 
     def test_multiple_option(self):
         @click.command()
@@ -99,6 +99,17 @@ class TestInferType:
         param = cli.params[0]
         assert _infer_type(param) == ("path", None)
 
+    def test_path_subclass(self):
+        class OutputPath(click.Path):
+            pass
+
+        @click.command()
+        @click.option("--output", type=OutputPath())
+        def cli(output):
+            pass
+        param = cli.params[0]
+        assert _infer_type(param) == ("path", None)
+
     def test_count_option(self):
         @click.command()
         @click.option("-v", "--verbose", count=True)
@@ -123,6 +134,15 @@ class TestInferType:
         param = cli.params[0]
         assert _infer_type(param) == ("string", None)
 
+    def test_override_applies_after_cached_inference(self):
+        @click.command()
+        @click.option("--count", type=str)
+        def cli(count):
+            pass
+        param = cli.params[0]
+        assert _infer_type(param) == ("string", None)
+        assert _infer_type(param, {"count": "integer"}) == ("integer", None)
+
 
 # --- _is_filtered_param ---
 
@@ -161,6 +181,16 @@ class TestIsFilteredParam:
         param = cli.params[0]
         assert _is_filtered_param(param) is False
 
+    def test_hidden_set_after_first_check(self):
+        @click.command()
+        @click.option("--format", help="Output format")
+        def cli(format):
+            pass
+        param = cli.params[0]
+        assert _is_filtered_param(param) is False
+        param.hidden = True
+        assert _is_filtered_param(param) is True
+
 
 # --- _extract_arg ---
 
@@ -330,6 +360,30 @@ class TestWalkCommands:
         assert "auth login" in names
         assert "auth logout" in names
 
+    def test_nested_order_is_depth_first(self):
+        @click.group("tool")
+        def cli():
+            pass
+
+        @cli.group()
+        def auth():
+            """Auth commands"""
+
+        @auth.command()
+        def logout():
+            """Log out"""
+
+        @auth.command()
+        def login():
+            """Log in"""
+
+        @cli.command()
+        def build():
+            """Build"""
+
+        commands = _walk_commands(cli)
+        assert [c.name for c in commands] == ["auth login", "auth logout", "build"]
+
     def test_hidden_commands_excluded(self):
         @click.group("tool")
         def cli():
@@ -347,6 +401,25 @@ class TestWalkCommands:
         assert len(commands) == 1
         assert commands[0].name == "public"
 
+    def test_custom_group_resolves_commands(self):
+        @click.command()
+        def lazy():
+            """Loaded on demand"""
+
+        class LazyGroup(click.Group):
+            def list_commands(self, ctx):
+                return ["lazy"]
+
+            def get_command(self, ctx, cmd_name):
+                return lazy if cmd_name == "lazy" else None
+
+        @click.group("tool", cls=LazyGroup)
+        def cli():
+            pass
+
+        commands = _walk_commands(cli)
+        assert [c.name for c in commands] == ["lazy"]
+
     def test_annotations_merged(self):
         @click.group("tool")
         def cli():
@@ -398,6 +471,32 @@ class TestWalkCommands:
         assert len(commands) == 1
         assert commands[0].name == "a b c"
 
+    def test_args_follow_cli_changes(self):
+        @click.group("tool")
+        def cli():
+            pass
+
+        @cli.command()
+        @click.option("--format", help="Output format")
+        def convert(format):
+            """Convert"""
+
+        assert [a.name for a in _walk_commands(cli)[0].args] == ["--format"]
+
+        click.option("--pretty", is_flag=True, help="Pretty")(convert)
+
+        @cli.command()
+        def validate():
+            """Validate"""
+
+        commands = _walk_commands(cli)
+        assert [c.name for c in commands] == ["convert", "validate"]
+        assert [a.name for a in commands[0].args] == ["--format", "--pretty"]
+
+        annotations = {"convert": CommandAnnotation(arg_types={"format": "enum"})}
+        annotated = _walk_commands(cli, annotations)
+        assert annotated[0].args[0].type == "enum"
+
     def test_filtered_params_excluded(self):
         @click.command("tool")
         @click.version_option("1.0.0")
@@ -502,6 +601,19 @@ class TestGenerateSchema:
         assert schema.auth.type == "oauth2"
         assert schema.auth.description == "OAuth2 authentication"
 
+    def test_multiline_help_uses_first_line(self):
+        @click.group("tool", help="\n  Tool summary\n\n  Longer details.\n")
+        def cli():
+            pass
+
+        @cli.command(help="Run it\nwith extra detail")
+        def run():
+            pass
+
+        schema = generate_schema(cli)
+        assert schema.description == "Tool summary"
+        assert schema.commands[0].description == "Run it"
+
     def test_no_version_produces_empty_string(self):
         @click.group("tool")
         def cli():
@@ -514,3 +626,54 @@ class TestGenerateSchema:
         schema = generate_schema(cli)
         assert schema.version == ""
         assert schema.spec_version == MTP_SPEC_VERSION
+
+
+# --- _describe_to_dict ---
+
+
+class TestDescribeToDict:
+    def test_matches_serialized_schema(self):
+        from mtp_sdk.types import IODescriptor, Example
+
+        @click.group("tool")
+        def cli():
+            """Tool"""
+
+        @cli.command()
+        @click.argument("input")
+        @click.option("--color", type=click.Choice(["red", "blue"]), default="red")
+        @click.option("--port", default="8080", help="Port")
+        @click.option("--verbose", is_flag=True, help="Verbose")
+        def serve(input, color, port, verbose):
+            """Serve files"""
+
+        @cli.group()
+        def auth():
+            """Auth"""
+
+        @auth.command()
+        def login():
+            """Log in"""
+
+        options = DescribeOptions(
+            version="1.0.0",
+            commands={
+                "serve": CommandAnnotation(
+                    arg_types={"port": "integer"},
+                    arg_descriptions={"input": "Input"},
+                    stdout=IODescriptor(content_type="application/json"),
+                    examples=[Example(description="Serve", command="tool serve .")],
+                ),
+            },
+            auth=AuthConfig(type="api-key", extra={"envVar": "TOOL_KEY"}),
+        )
+
+        assert _describe_to_dict(cli, options) == to_dict(generate_schema(cli, options))
+
+    def test_single_command_without_options(self):
+        @click.command("greet")
+        @click.argument("name")
+        def cli(name):
+            """Greet"""
+
+        assert _describe_to_dict(cli) == to_dict(generate_schema(cli))
@@ -0,0 +1,112 @@
+import dataclasses
+import sys
+
+import pytest
+
+from mtp_sdk.types import (
+    ArgDescriptor,
+    AuthConfig,
+    CommandAnnotation,
+    CommandDescriptor,
+    DescribeOptions,
+    Example,
+    IODescriptor,
+    ToolSchema,
+    to_dict,
+)
+
+
+class TestToDict:
+    def test_primitive_list_copied(self):
+        arg = ArgDescriptor(name="--color", type="enum", values=["red", "green"])
+        data = to_dict(arg)
+        assert data["values"] == ["red", "green"]
+        assert data["values"] is not arg.values
+
+    def test_untyped_default_converted_generically(self):
+        arg = ArgDescriptor(name="--pair", type="array", default=[1, 2])
+        assert to_dict(arg) == {"name": "--pair", "type": "array", "default": [1, 2]}
+
+    def test_none_fields_omitted(self):
+        schema = ToolSchema(name="tool", version="", description="")
+        assert to_dict(schema) == {
+            "name": "tool",
+            "version": "",
+            "description": "",
+            "specVersion": "",
+            "commands": [],
+        }
+
+    def test_auth_extra_flattened(self):
+        auth = AuthConfig(type="api-key", extra={"envVar": "TOOL_API_KEY"})
+        assert to_dict(auth) == {"type": "api-key", "envVar": "TOOL_API_KEY"}
+        replaced = dataclasses.replace(auth, description="API key")
+        assert to_dict(replaced) == {
+            "type": "api-key",
+            "description": "API key",
+            "envVar": "TOOL_API_KEY",
+        }
+
+    def test_args_by_name(self):
+        cmd = CommandDescriptor(
+            name="convert",
+            description="Convert files",
+            args=[
+                ArgDescriptor(name="input", type="string", required=True),
+                ArgDescriptor(name="--format", type="enum", values=["json", "csv"]),
+                ArgDescriptor(name="--ratio", type="number"),
+            ],
+        )
+        args = cmd.args_by_name()
+        assert list(args) == ["input", "--format", "--ratio"]
+        assert args["--format"].values == ["json", "csv"]
+        assert CommandDescriptor(name="run", description="Run").args_by_name() == {}
+        assert "argsByName" not in to_dict(cmd)
+
+    def test_subclass_fields_serialized(self):
+        @dataclasses.dataclass
+        class HintedArg(ArgDescriptor):
+            hint: str = "h"
+
+        arg = HintedArg(name="n", type="string")
+        assert to_dict(arg) == {"name": "n", "type": "string", "hint": "h"}
+
+    def test_auth_edits_after_construction_serialized(self):
+        auth = AuthConfig(type="oauth2")
+        auth.description = "OAuth"
+        auth.extra = {"authorizationUrl": "u"}
+        assert to_dict(auth) == {
+            "type": "oauth2",
+            "description": "OAuth",
+            "authorizationUrl": "u",
+        }
+        assert [f.name for f in dataclasses.fields(AuthConfig)] == ["type", "description", "extra"]
+
+    def test_nested_dataclass_list(self):
+        cmd = CommandDescriptor(
+            name="run",
+            description="Run",
+            examples=[Example(description="Run it", command="tool run")],
+        )
+        assert to_dict(cmd)["examples"] == [{"description": "Run it", "command": "tool run"}]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+@pytest.mark.parametrize(
+    "obj",
+    [
+        ArgDescriptor(name="--format", type="string"),
+        AuthConfig(type="api-key", extra={"envVar": "KEY"}),
+        CommandAnnotation(arg_descriptions={"input": "Input"}),
+        CommandDescriptor(name="run", description="Run"),
+        DescribeOptions(version="1.0.0"),
+        Example(description="Run", command="tool run"),
+        IODescriptor(content_type="text/plain"),
+        ToolSchema(name="tool", version="", description=""),
+    ],
+    ids=lambda obj: type(obj).__name__,
+)
+def test_schema_types_are_slotted(obj):
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.nickname = "fmt"
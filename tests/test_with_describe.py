@@ -1,9 +1,13 @@
+import io
 import json
+import sys
 
 import click
+import pytest
 from click.testing import CliRunner
 
-from mtp_sdk import describe, with_describe
+import mtp_sdk
+from mtp_sdk import describe, to_dict, with_describe
 from mtp_sdk.types import (
     AuthConfig,
     CommandAnnotation,
@@ -91,6 +95,84 @@ class TestDescribe:
         assert schema.commands[0].name == "_root"
         assert len(schema.commands[0].args) == 2
 
+    def test_repeat_describe_reflects_cli_changes(self):
+        @click.group("tool")
+        def cli():
+            """A tool"""
+
+        @cli.command()
+        def run():
+            """Run"""
+
+        options = DescribeOptions(version="1.0.0")
+        first = describe(cli, options)
+        first.commands.clear()
+
+        @cli.command()
+        def stop():
+            """Stop"""
+
+        second = describe(cli, options)
+        assert second is not first
+        assert [c.name for c in second.commands] == ["run", "stop"]
+
+    def test_repeat_describe_reflects_replaced_command_and_param(self):
+        @click.group("tool")
+        def cli():
+            """A tool"""
+
+        @cli.command()
+        @click.option("--old", help="Old")
+        def run(old):
+            """Run"""
+
+        describe(cli)
+
+        @click.command()
+        def replacement():
+            """Replacement"""
+
+        cli.add_command(replacement, "run")
+        assert describe(cli).commands[0].description == "Replacement"
+
+        @cli.command()
+        def secret():
+            """Secret"""
+
+        assert [c.name for c in describe(cli).commands] == ["run", "secret"]
+        secret.hidden = True
+        assert [c.name for c in describe(cli).commands] == ["run"]
+        assert not hasattr(cli, "__mtp_subcommands__")
+
+        replacement.params.append(click.Option(["--old"], help="Old"))
+        describe(cli)
+        replacement.params[0] = click.Option(["--new"], help="New")
+        assert [a.name for a in describe(cli).commands[0].args] == ["--new"]
+
+    def test_repeat_describe_reflects_annotation_and_param_edits(self):
+        @click.command("tool")
+        @click.argument("input")
+        @click.option("--fmt", default="json", help="Format")
+        def cli(input, fmt):
+            """A tool"""
+
+        annotation = CommandAnnotation(arg_descriptions={"input": "old"})
+        options = DescribeOptions(commands={"_root": annotation})
+        describe(cli, options)
+
+        annotation.arg_descriptions["input"] = "new"
+        annotation.arg_types = {"fmt": "enum"}
+        cli.params[1].help = "Output format"
+        cli.params[1].default = "csv"
+        args = describe(cli, options).commands[0].args
+        assert args[0].description == "new"
+        assert (args[1].type, args[1].description, args[1].default) == (
+            "enum",
+            "Output format",
+            "csv",
+        )
+        assert not hasattr(cli, "__mtp_args__")
+
     def test_auth_config(self):
         @click.group("tool")
         def cli():
@@ -194,6 +276,65 @@ class TestWithDescribe:
         assert result.exit_code == 0
         assert "Hello, World!" in result.output
 
+    def test_no_schema_work_without_flag(self, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("schema built without --mtp-describe")
+
+        monkeypatch.setattr(mtp_sdk, "_describe_to_dict", fail)
+        monkeypatch.setattr(mtp_sdk, "generate_schema", fail)
+
+        @click.command("greet")
+        @click.argument("name")
+        def cli(name):
+            """Greet someone"""
+            click.echo(f"Hello, {name}!")
+
+        with_describe(cli, DescribeOptions(version="1.0.0"))
+
+        result = CliRunner().invoke(cli, ["World"])
+        assert result.exit_code == 0
+        assert "Hello, World!" in result.output
+
+    def test_describe_skipped_during_resilient_parsing(self, monkeypatch):
+        @click.command("tool")
+        def cli():
+            """A tool"""
+
+        with_describe(cli)
+        out = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", out)
+        # Would raise click's Exit if the callback printed the schema
+        cli.make_context("tool", ["--mtp-describe"], resilient_parsing=True)
+        assert out.getvalue() == ""
+
+    def test_repeat_describe_reuses_cached_json(self):
+        @click.command("tool")
+        @click.option("--format", help="Format")
+        def cli(format):
+            """A tool"""
+
+        with_describe(cli, DescribeOptions(version="1.0.0"))
+
+        runner = CliRunner()
+        first = runner.invoke(cli, ["--mtp-describe"])
+        cached = cli.__mtp_describe_bytes__[1]
+        second = runner.invoke(cli, ["--mtp-describe"])
+        assert first.exit_code == 0
+        assert second.exit_code == 0
+        assert first.output == second.output
+        assert cli.__mtp_describe_bytes__[1] is cached
+
+    def test_describe_to_text_only_stdout(self, monkeypatch):
+        @click.command("tool")
+        def cli():
+            """A tool"""
+
+        with_describe(cli, DescribeOptions(version="1.0.0"))
+        out = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", out)
+        assert cli.main(["--mtp-describe"], standalone_mode=False) == 0
+        assert json.loads(out.getvalue())["name"] == "tool"
+
 
 class TestToDictSerialization:
     def test_camel_case_keys(self):
@@ -266,3 +407,44 @@ class TestToDictSerialization:
         assert schema["auth"]["type"] == "oauth2"
         assert schema["auth"]["authorizationUrl"] == "https://example.com/auth"
         assert "extra" not in schema["auth"]
+
+    @pytest.mark.parametrize("encoder", ["orjson", "msgspec", None])
+    def test_encoder_output_matches_builtin(self, monkeypatch, encoder):
+        @click.command("tool")
+        @click.option("--ratio", type=float, default=0.5, help="Ratio")
+        def cli(ratio):
+            """A tool"""
+
+        data = to_dict(describe(cli, DescribeOptions(version="1.0.0")))
+        expected = json.dumps(data, separators=(",", ":")).encode()
+        _use_encoder(monkeypatch, encoder)
+        assert json.loads(mtp_sdk._dumps(data)) == json.loads(expected)
+
+    @pytest.mark.parametrize("encoder", ["orjson", "msgspec"])
+    def test_encoder_falls_back_on_inputs_it_rejects(self, monkeypatch, encoder):
+        @click.command("tool")
+        @click.option("--big", type=int, default=2**70, help="Big")
+        def cli(big):
+            """A tool"""
+
+        options = DescribeOptions(
+            commands={"_root": CommandAnnotation(stdin=IODescriptor(schema={1: "one"}))},
+        )
+        data = to_dict(describe(cli, options))
+        _use_encoder(monkeypatch, encoder)
+        decoded = json.loads(mtp_sdk._dumps(data))
+        assert decoded["commands"][0]["args"][0]["default"] == 2**70
+        assert decoded["commands"][0]["stdin"]["schema"] == {"1": "one"}
+
+
+def _use_encoder(monkeypatch, name):
+    """Make _dumps pick the named optional encoder, or the stdlib for None."""
+    monkeypatch.setattr(mtp_sdk, "orjson", None)
+    monkeypatch.setattr(mtp_sdk, "msgspec", None)
+    if name == "orjson":
+        monkeypatch.setattr(mtp_sdk, "orjson", pytest.importorskip("orjson"))
+    elif name == "msgspec":
+        pytest.importorskip("msgspec.json")
+        import msgspec
+
+        monkeypatch.setattr(mtp_sdk, "msgspec", msgspec)